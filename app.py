@@ -1,5 +1,6 @@
 # app.py
 import streamlit as st
+import itertools
 import os
 import time
 from data_loader.document_processor import DocumentProcessor
@@ -67,9 +68,10 @@ class SimpleChatApp:
                                 csv_docs = self.document_processor.load_csv_documents(csv_path)
                                 break
                         
-                        all_docs = pdf_docs + csv_docs
-                        if all_docs:
-                            self.document_processor.create_vector_store(all_docs, save_locally=True)
+                        # Loaders are generators; chain them so documents stream
+                        # into the vector store without materializing the corpus
+                        all_docs = itertools.chain(pdf_docs, csv_docs)
+                        self.document_processor.create_vector_store(all_docs, save_locally=True)
                 
                 # Initialize multi-agent system
                 self.multi_agent_system = MultiAgentSystem(self.document_processor)
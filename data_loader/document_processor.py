@@ -1,41 +1,299 @@
 # data_loader/document_processor.py
-import PyPDF2
 import pandas as pd
 import faiss
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
+import asyncio
+import functools
+import io
 import os
 import json
+import re
 import boto3
+import hashlib
 import pickle
+import sqlite3
+import threading
 import time
 import random
+from botocore.config import Config
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+try:
+    # pypdf is the maintained successor to PyPDF2 with a faster extractor,
+    # and is what requirements.txt installs
+    from pypdf import PdfReader
+except ImportError:
+    from PyPDF2 import PdfReader
+
+try:
+    # C-backed PDFium bindings extract text 5-10x faster than PyPDF2's
+    # pure-Python extractor; PyPDF2 remains the fallback engine
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+try:
+    # Parquet loads the document store several times faster than pickle and
+    # compresses much smaller; pickle remains the fallback format
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from pyarrow import csv as pa_csv
+except ImportError:
+    pa = None
+
+try:
+    # Async Bedrock client scales to many more in-flight requests than the
+    # thread pool, which tops out on GIL contention around ~16 workers
+    import aioboto3
+except ImportError:
+    aioboto3 = None
+
+try:
+    # ~3x faster than stdlib json on the small per-request payloads
+    import orjson
+except ImportError:
+    orjson = None
+
+def _embed_request_body(clean_text: str):
+    """Serialize a Titan embedding request body; invoke_model accepts bytes
+    or str.
+
+    The payload shape is fixed, so with orjson only the text itself is
+    JSON-escaped and spliced into a precomputed byte template — no dict
+    build or full-encoder dispatch on the hot path.
+    """
+    if orjson is not None:
+        return b'{"inputText":' + orjson.dumps(clean_text) + b'}'
+    return json.dumps({"inputText": clean_text})
+
+def _parse_response_body(raw) -> Dict[str, Any]:
+    """Parse a Bedrock response body; orjson decodes the ~1536-float
+    embedding array several times faster than stdlib json"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+@functools.lru_cache(maxsize=1)
+def _fallback_model():
+    """Load the local fallback model once per process, shared by all
+    DocumentProcessor instances.
+
+    Prefers the quantized ONNX export, which runs the MiniLM matmuls as
+    int8 (VNNI on supporting CPUs) for roughly 2-4x over the FP32 PyTorch
+    path; falls back to the default backend when the ONNX extras aren't
+    installed.
+    """
+    from sentence_transformers import SentenceTransformer
+    try:
+        model = SentenceTransformer(
+            'all-MiniLM-L6-v2',
+            backend='onnx',
+            model_kwargs={'file_name': 'onnx/model_qint8_avx512_vnni.onnx'}
+        )
+        print("✅ Loaded quantized ONNX fallback model")
+        return model
+    except Exception as e:
+        print(f"⚠️ Quantized ONNX fallback unavailable ({e}), using default backend")
+        return SentenceTransformer('all-MiniLM-L6-v2')
+
+def _extract_pdf_text(filepath: str):
+    """Extract page-tagged text from one PDF file.
+
+    Module-level (not a method) so it pickles cleanly into worker
+    processes; errors are swallowed into an empty result because an
+    exception raised in a worker would abort the whole extraction map.
+    """
+    try:
+        if pdfium is not None:
+            pdf = pdfium.PdfDocument(filepath)
+            try:
+                parts = []
+                for page_num, page in enumerate(pdf):
+                    page_text = page.get_textpage().get_text_range()
+                    if page_text:
+                        parts.append(f"Page {page_num + 1}: {page_text}\n")
+                return filepath, "".join(parts)
+            finally:
+                pdf.close()
+
+        with open(filepath, 'rb') as file:
+            pdf_reader = PdfReader(file)
+            parts = []
+
+            for page_num, page in enumerate(pdf_reader.pages):
+                page_text = page.extract_text()
+                if page_text:
+                    parts.append(f"Page {page_num + 1}: {page_text}\n")
+
+        return filepath, "".join(parts)
+    except Exception as e:
+        print(f"Error processing {os.path.basename(filepath)}: {e}")
+        return filepath, ""
+
+EMBEDDING_MODEL_ID = "amazon.titan-embed-text-v1"
+
+# Above this many vectors, brute-force search costs more than an HNSW graph
+HNSW_THRESHOLD = 10_000
+
+# FAISS parallelizes across queries with OpenMP; set this once at import
+try:
+    faiss.omp_set_num_threads(os.cpu_count() or 1)
+except Exception:
+    pass
+
+# Collapses any whitespace run (including newlines) in a single pass
+_WS_RE = re.compile(r'\s+')
+
+# Titan's input limit tracks bytes/tokens, not Python characters; a byte
+# budget keeps multibyte UTF-8 text from overflowing the request
+_MAX_EMBED_BYTES = 30_000
+
+# How many recent query embeddings to keep in memory per processor
+_QUERY_CACHE_SIZE = 1024
+
 class DocumentProcessor:
-    def __init__(self, storage_dir: str = "vector_store"):
-        self.bedrock_runtime = boto3.client('bedrock-runtime', region_name='us-east-1')
+    def __init__(self, storage_dir: str = "vector_store", max_workers: int = 16,
+                 quantize_embeddings: bool = None, use_hnsw: bool = None):
+        # botocore clients are thread-safe; size the connection pool for the
+        # embedding thread pool so parallel invoke_model calls don't queue,
+        # keep sockets alive between calls to skip TLS re-handshakes, and
+        # let adaptive retries pace the client under Bedrock throttling
+        self.bedrock_runtime = boto3.client(
+            'bedrock-runtime',
+            region_name='us-east-1',
+            config=Config(
+                max_pool_connections=max(64, max_workers * 2),
+                retries={'max_attempts': 3, 'mode': 'adaptive'},
+                tcp_keepalive=True,
+                read_timeout=30
+            )
+        )
+        self.max_workers = max_workers
+        # 8-bit scalar quantization cuts index memory 4x with little recall
+        # loss. None means automatic: quantize the corpora large enough to
+        # be rebuilt as HNSW, where the brute-force scan is memory-bound
+        # anyway; keep exact float32 vectors for small stores
+        self.quantize_embeddings = quantize_embeddings
+        # use_hnsw=True/False forces graph search on or off; None picks
+        # automatically from corpus size (HNSW above HNSW_THRESHOLD vectors)
+        self.use_hnsw = use_hnsw
         self.storage_dir = storage_dir
         self.index = None
         self.documents = []
+        # In-memory LRU for query embeddings: Streamlit rerun cycles repeat
+        # identical queries seconds apart, and this answers them without
+        # even the disk-cache lookup
+        self._query_cache = OrderedDict()
+        # Running stats counters, maintained as documents are added so the
+        # stats endpoints don't rescan the whole corpus per call
+        self._type_counts = Counter()
+        self._source_counts = Counter()
         self.metadata_file = os.path.join(storage_dir, "metadata.json")
         
         # Create storage directory if it doesn't exist
         os.makedirs(storage_dir, exist_ok=True)
-    
-    def get_bedrock_embedding(self, text: str, max_retries: int = 5) -> List[float]:
-        """Get embeddings using Amazon Titan Embeddings via Bedrock with retry logic"""
+
+        # Disk-backed embedding cache so re-indexing unchanged chunks and
+        # repeated queries skip Bedrock entirely
+        self._cache_lock = threading.Lock()
+        try:
+            self._emb_cache = sqlite3.connect(
+                os.path.join(storage_dir, "emb_cache.db"),
+                check_same_thread=False
+            )
+            self._emb_cache.execute("PRAGMA journal_mode=WAL")
+            # Cache entries are rebuildable, so don't fsync every insert
+            self._emb_cache.execute("PRAGMA synchronous=NORMAL")
+            # Version 1 stores vectors as float16; drop any pre-versioned
+            # float32 cache rather than misreading its blobs
+            if self._emb_cache.execute("PRAGMA user_version").fetchone()[0] < 1:
+                self._emb_cache.execute("DROP TABLE IF EXISTS embedding_cache")
+                self._emb_cache.execute("PRAGMA user_version = 1")
+            self._emb_cache.execute(
+                "CREATE TABLE IF NOT EXISTS embedding_cache (hash BLOB PRIMARY KEY, vec BLOB)"
+            )
+            self._emb_cache.commit()
+        except Exception as e:
+            print(f"⚠️ Embedding cache unavailable: {e}")
+            self._emb_cache = None
+
+    def _cache_key(self, clean_text: str) -> bytes:
+        """Cache key: hash of model id + cleaned text, so a model change invalidates"""
+        return hashlib.sha256(f"{EMBEDDING_MODEL_ID}|{clean_text}".encode()).digest()
+
+    def _cache_get(self, clean_text: str):
+        """Look up a cached embedding, returning None on miss or cache failure"""
+        if self._emb_cache is None:
+            return None
+        try:
+            with self._cache_lock:
+                row = self._emb_cache.execute(
+                    "SELECT vec FROM embedding_cache WHERE hash = ?",
+                    (self._cache_key(clean_text),)
+                ).fetchone()
+            if row:
+                # Upcast the stored float16 back to float32 for callers;
+                # modern CPUs do the conversion in vectorized hardware
+                return np.frombuffer(row[0], dtype=np.float16).astype(np.float32).tolist()
+        except Exception as e:
+            print(f"⚠️ Embedding cache read failed: {e}")
+        return None
+
+    def _cache_put(self, clean_text: str, embedding: List[float]):
+        """Store an embedding in the cache as a float16 blob (half the disk
+        and I/O of float32, negligible cosine-recall impact)"""
+        if self._emb_cache is None:
+            return
+        try:
+            vec = np.asarray(embedding, dtype=np.float16).tobytes()
+            with self._cache_lock:
+                self._emb_cache.execute(
+                    "INSERT OR IGNORE INTO embedding_cache (hash, vec) VALUES (?, ?)",
+                    (self._cache_key(clean_text), vec)
+                )
+                self._emb_cache.commit()
+        except Exception as e:
+            print(f"⚠️ Embedding cache write failed: {e}")
+
+    @staticmethod
+    def _is_embeddable(text: str) -> bool:
+        """Cheap in-process gate for chunks worth sending to Bedrock"""
+        if not text or len(text.strip()) < 20:
+            return False
+        # Require a minimum of alphanumeric signal, not just punctuation runs
+        return sum(c.isalnum() for c in text) >= 10
+
+    @staticmethod
+    def _clean_text(text: str) -> str:
+        """Collapse whitespace and truncate to the Bedrock byte budget"""
+        clean_text = _WS_RE.sub(' ', text).strip()
+        encoded = clean_text.encode('utf-8')
+        if len(encoded) > _MAX_EMBED_BYTES:  # Bedrock limit
+            clean_text = encoded[:_MAX_EMBED_BYTES].decode('utf-8', 'ignore')
+        return clean_text
+
+    def get_bedrock_embedding(self, text: str, max_retries: int = 5,
+                              use_fallback: bool = True) -> List[float]:
+        """Get embeddings using Amazon Titan Embeddings via Bedrock with retry logic.
+
+        With use_fallback=False a Bedrock failure returns None instead of a
+        local fallback embedding, letting batch callers collect the failures
+        and fall back in one batched encode.
+        """
+        clean_text = self._clean_text(text)
+
+        # Serve identical content from the disk cache without touching Bedrock
+        cached = self._cache_get(clean_text)
+        if cached is not None:
+            return cached
+
+        body = _embed_request_body(clean_text)
+
         for attempt in range(max_retries):
             try:
-                # Clean and prepare text
-                clean_text = text.replace('\n', ' ').strip()
-                if len(clean_text) > 10000:  # Bedrock limit
-                    clean_text = clean_text[:10000]
-                
-                body = json.dumps({
-                    "inputText": clean_text
-                })
-                
                 # Add exponential backoff with jitter
                 if attempt > 0:
                     base_delay = min(2 ** attempt + random.uniform(0, 1), 60)  # Max 60 seconds
@@ -44,19 +302,18 @@ class DocumentProcessor:
                 
                 response = self.bedrock_runtime.invoke_model(
                     body=body,
-                    modelId="amazon.titan-embed-text-v1",
+                    modelId=EMBEDDING_MODEL_ID,
                     accept="application/json",
                     contentType="application/json"
                 )
-                
-                response_body = json.loads(response.get('body').read())
+
+                response_body = _parse_response_body(response.get('body').read())
                 embedding = response_body.get('embedding', [])
-                
+
                 if not embedding:
                     raise ValueError("Empty embedding received")
-                
-                # Small delay between successful calls to avoid throttling
-                time.sleep(0.2)
+
+                self._cache_put(clean_text, embedding)
                 return embedding
                     
             except Exception as e:
@@ -74,79 +331,225 @@ class DocumentProcessor:
                     break
         
         # If all retries failed, use fallback
+        if not use_fallback:
+            return None
         print("🔄 Switching to fallback embeddings after Bedrock failures")
         return self._get_fallback_embedding(text)
     
+    def get_bedrock_embeddings_batch(self, texts: List[str], pool: ThreadPoolExecutor = None) -> List[Any]:
+        """Embed a batch of texts, returning embeddings in input order.
+
+        Titan's invoke_model accepts one text per request, so the batch is
+        fanned out over the shared client's persistent connections instead of
+        opening a fresh call path per text; failures come back as None so the
+        caller can filter without losing alignment.
+        """
+        embeddings = None
+        if aioboto3 is not None:
+            try:
+                embeddings = asyncio.run(self._aget_embeddings(texts))
+            except Exception as e:
+                print(f"⚠️ Async embedding pipeline failed ({e}), using thread pool")
+
+        if embeddings is None:
+            embeddings = [None] * len(texts)
+
+            own_pool = pool is None
+            if own_pool:
+                pool = ThreadPoolExecutor(max_workers=self.max_workers)
+
+            try:
+                futures = {
+                    pool.submit(self.get_bedrock_embedding, text, 5, False): i
+                    for i, text in enumerate(texts)
+                }
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        embeddings[i] = future.result()
+                    except Exception as e:
+                        print(f"❌ Error embedding batch item {i + 1}: {e}")
+            finally:
+                if own_pool:
+                    pool.shutdown()
+
+        # Everything Bedrock couldn't embed falls back in one batched local
+        # encode instead of N separate forward passes
+        failed = [i for i, emb in enumerate(embeddings) if not emb]
+        if failed:
+            print(f"🔄 Switching to fallback embeddings for {len(failed)} texts")
+            fallback_embeddings = self._get_fallback_embeddings_batch(
+                [texts[i] for i in failed]
+            )
+            for i, emb in zip(failed, fallback_embeddings):
+                embeddings[i] = emb
+
+        return embeddings
+
+    async def aget_bedrock_embedding(self, text: str) -> List[float]:
+        """Async counterpart of get_bedrock_embedding.
+
+        Lets UI event loops await the embedding instead of blocking a
+        worker thread on the full Bedrock round trip.
+        """
+        if aioboto3 is None:
+            # No async client available; degrade to the sync path
+            return self.get_bedrock_embedding(text)
+
+        embedding = (await self._aget_embeddings([text]))[0]
+        if embedding:
+            return embedding
+        print("🔄 Switching to fallback embeddings after Bedrock failures")
+        return self._get_fallback_embedding(text)
+
+    async def _aget_embeddings(self, texts: List[str], max_in_flight: int = 64) -> List[Any]:
+        """Embed texts over one async Bedrock client on a single event loop.
+
+        Hundreds of requests can be in flight without thread-per-request
+        overhead or GIL contention; max_in_flight bounds concurrency so
+        Bedrock TPS limits aren't slammed. Failures come back as None,
+        matching get_bedrock_embeddings_batch.
+        """
+        semaphore = asyncio.Semaphore(max_in_flight)
+        session = aioboto3.Session()
+
+        async with session.client('bedrock-runtime', region_name='us-east-1') as client:
+
+            async def embed_one(text):
+                clean_text = self._clean_text(text)
+
+                cached = self._cache_get(clean_text)
+                if cached is not None:
+                    return cached
+
+                body = _embed_request_body(clean_text)
+                for attempt in range(3):
+                    try:
+                        async with semaphore:
+                            response = await client.invoke_model(
+                                body=body,
+                                modelId=EMBEDDING_MODEL_ID,
+                                accept="application/json",
+                                contentType="application/json"
+                            )
+                            raw = await response['body'].read()
+                        embedding = _parse_response_body(raw).get('embedding', [])
+                        if not embedding:
+                            raise ValueError("Empty embedding received")
+                        self._cache_put(clean_text, embedding)
+                        return embedding
+                    except Exception as e:
+                        if attempt < 2:
+                            await asyncio.sleep(2 ** attempt + random.uniform(0, 1))
+                        else:
+                            print(f"❌ Async embedding failed: {e}")
+                            return None
+
+            return list(await asyncio.gather(*(embed_one(text) for text in texts)))
+
     def _get_fallback_embedding(self, text: str) -> List[float]:
         """Fallback embedding using sentence transformers"""
         try:
-            from sentence_transformers import SentenceTransformer
-            # Use a smaller model for faster loading
-            model = SentenceTransformer('all-MiniLM-L6-v2')
-            embedding = model.encode(text).tolist()
+            embedding = _fallback_model().encode(text).tolist()
             print("✅ Using local fallback embeddings")
             return embedding
         except Exception as e:
             print(f"❌ Fallback embedding failed: {e}")
             # Return zero vector as last resort
             return [0.0] * 384
+
+    def _get_fallback_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Batch fallback embedding; one forward pass amortizes model overhead"""
+        try:
+            embeddings = _fallback_model().encode(
+                texts, batch_size=32, show_progress_bar=False
+            )
+            print(f"✅ Using local fallback embeddings for {len(texts)} texts")
+            return [emb.tolist() for emb in embeddings]
+        except Exception as e:
+            print(f"❌ Batch fallback embedding failed: {e}")
+            # Return zero vectors as last resort
+            return [[0.0] * 384 for _ in texts]
     
-    def load_pdf_documents(self, pdf_folder: str) -> List[Dict[str, Any]]:
-        """Load and process PDF documents with chunking for better embeddings"""
-        pdf_docs = []
-        
+    def load_pdf_documents(self, pdf_folder: str) -> Iterator[Dict[str, Any]]:
+        """Load and process PDF documents, yielding chunks one at a time.
+
+        Returning a generator keeps peak memory at one document instead of
+        the whole corpus, so create_vector_store can start embedding while
+        later PDFs are still being parsed.
+        """
         if not os.path.exists(pdf_folder):
             print(f"PDF folder {pdf_folder} does not exist")
-            return pdf_docs
-            
-        for filename in os.listdir(pdf_folder):
-            if filename.endswith('.pdf'):
-                filepath = os.path.join(pdf_folder, filename)
-                try:
-                    with open(filepath, 'rb') as file:
-                        pdf_reader = PyPDF2.PdfReader(file)
-                        text = ""
-                        
-                        for page_num, page in enumerate(pdf_reader.pages):
-                            page_text = page.extract_text()
-                            if page_text:
-                                text += f"Page {page_num + 1}: {page_text}\n"
-                        
-                        if text.strip():
-                            # Chunk the document for better embeddings
-                            chunks = self._chunk_text(text, chunk_size=1000, overlap=200)
-                            
-                            for i, chunk in enumerate(chunks):
-                                pdf_docs.append({
-                                    'source': f"{filename}_chunk_{i+1}",
-                                    'content': chunk,
-                                    'type': 'pdf',
-                                    'original_file': filename,
-                                    'chunk_id': i,
-                                    'file_path': filepath,
-                                    'total_chunks': len(chunks)
-                                })
-                        else:
-                            print(f"No text extracted from {filename}")
-                            
-                except Exception as e:
-                    print(f"Error processing {filename}: {e}")
-                    
-        print(f"Loaded {len(pdf_docs)} PDF chunks from {pdf_folder}")
-        return pdf_docs
+            return
+
+        filepaths = [
+            os.path.join(pdf_folder, filename)
+            for filename in os.listdir(pdf_folder)
+            if filename.endswith('.pdf')
+        ]
+
+        chunk_count = 0
+        for filepath, text in self._extract_pdfs(filepaths):
+            filename = os.path.basename(filepath)
+            if text.strip():
+                # Chunk the document for better embeddings
+                chunks = self._chunk_text(text, chunk_size=1000, overlap=200)
+
+                for i, chunk in enumerate(chunks):
+                    chunk_count += 1
+                    yield {
+                        'source': f"{filename}_chunk_{i+1}",
+                        'content': chunk,
+                        'type': 'pdf',
+                        'original_file': filename,
+                        'chunk_id': i,
+                        'file_path': filepath,
+                        'total_chunks': len(chunks)
+                    }
+            else:
+                print(f"No text extracted from {filename}")
+
+        print(f"Loaded {chunk_count} PDF chunks from {pdf_folder}")
+
+    def _extract_pdfs(self, filepaths: List[str]) -> Iterator[Any]:
+        """Extract text from PDFs, fanning out across CPU cores when there
+        are several files — PyPDF2 extraction is CPU-bound pure Python, so
+        a process pool gives near-linear speedup across files."""
+        if len(filepaths) <= 1:
+            yield from map(_extract_pdf_text, filepaths)
+            return
+
+        workers = min(len(filepaths), max(1, (os.cpu_count() or 2) - 1))
+        produced = 0
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for result in pool.map(_extract_pdf_text, filepaths, chunksize=2):
+                    yield result
+                    produced += 1
+        except Exception as e:
+            # Worker processes can be unavailable (restricted environments);
+            # finish the remaining files in-process
+            print(f"⚠️ Parallel PDF extraction failed ({e}), extracting sequentially")
+            yield from map(_extract_pdf_text, filepaths[produced:])
     
-    def load_csv_documents(self, csv_path: str) -> List[Dict[str, Any]]:
-        """Load and process CSV documents with robust error handling"""
-        csv_docs = []
-        
+    def load_csv_documents(self, csv_path: str) -> Iterator[Dict[str, Any]]:
+        """Load and process CSV documents with robust error handling.
+
+        Yields one representation at a time so downstream embedding can
+        stream instead of materializing every representation up front.
+        """
         if not os.path.exists(csv_path):
             print(f"CSV file {csv_path} does not exist")
-            return csv_docs
-            
+            return
+
         try:
             # Try different CSV reading strategies
             df = None
             strategies = [
+                # Strategy 0: Arrow's multi-threaded C++ reader parses in one
+                # pass, typically 5-10x faster than pandas with a fraction of
+                # the RAM; skipped when pyarrow isn't installed
+                lambda: self._arrow_csv_read(csv_path),
                 # Strategy 1: Standard read
                 lambda: pd.read_csv(csv_path),
                 # Strategy 2: Handle different separators
@@ -169,28 +572,33 @@ class DocumentProcessor:
             if df is None or df.empty:
                 print(f"❌ All CSV loading strategies failed for {csv_path}")
                 # Try raw text fallback
-                return self._load_csv_as_raw_text(csv_path)
-                
+                yield from self._load_csv_as_raw_text(csv_path)
+                return
+
             # Create multiple representations of the CSV data
             representations = []
-            
+
+            # Computed once and reused by the summary and the column loop
+            columns_list = df.columns.tolist()
+            dtype_map = df.dtypes.to_dict()
+
             # 1. Overall summary
             summary_content = f"""
             CSV Data Summary:
             - File: {os.path.basename(csv_path)}
             - Rows: {len(df)}
-            - Columns: {len(df.columns)}
-            - Columns: {', '.join(df.columns.tolist())}
-            - Data Types: {df.dtypes.to_dict()}
-            - Missing Values: {df.isnull().sum().to_dict()}
+            - Columns: {len(columns_list)}
+            - Columns: {', '.join(columns_list)}
+            - Data Types: {dtype_map}
+            - Missing Values: {df.isna().sum().to_dict()}
             """
             representations.append(summary_content)
-            
+
             # 2. Column-wise descriptions
-            for column in df.columns:
+            for column in columns_list:
                 col_summary = f"""
                 Column: {column}
-                Type: {df[column].dtype}
+                Type: {dtype_map[column]}
                 Unique Values: {df[column].nunique()}
                 Sample Values: {df[column].dropna().head(3).tolist()}
                 """
@@ -199,33 +607,41 @@ class DocumentProcessor:
             # 3. Statistical summary for numeric columns
             numeric_cols = df.select_dtypes(include=[np.number]).columns
             if not numeric_cols.empty:
+                buf = io.StringIO()
+                df[numeric_cols].describe().to_csv(buf)
                 stats_content = f"""
                 Statistical Summary:
-                {df[numeric_cols].describe().to_string()}
+                {buf.getvalue()}
                 """
                 representations.append(stats_content)
             
-            # 4. Data chunks for larger CSVs
+            # 4. Data chunks for larger CSVs. to_csv into a StringIO runs in
+            # pandas' C writer, unlike to_string which formats every cell in
+            # Python; the embedder truncates at 10k chars anyway, so cap the
+            # representation at the same budget.
             if len(df) > 20:
                 chunk_size = 10
                 for i in range(0, min(len(df), 50), chunk_size):  # Limit to first 50 rows
-                    chunk = df.iloc[i:i+chunk_size]
+                    buf = io.StringIO()
+                    df.iloc[i:i+chunk_size].to_csv(buf, index=False)
                     chunk_content = f"""
                     Data Chunk {i//chunk_size + 1} (Rows {i+1}-{min(i+chunk_size, len(df))}):
-                    {chunk.to_string(max_rows=10, max_cols=10)}
+                    {buf.getvalue()[:10000]}
                     """
                     representations.append(chunk_content)
             else:
                 # Full data for small CSVs
+                buf = io.StringIO()
+                df.head(20).to_csv(buf, index=False)
                 full_data_content = f"""
                 Complete Data (first 20 rows):
-                {df.head(20).to_string(max_rows=20, max_cols=10)}
+                {buf.getvalue()[:10000]}
                 """
                 representations.append(full_data_content)
             
             # Create document entries for each representation
             for i, content in enumerate(representations):
-                csv_docs.append({
+                yield {
                     'source': f"{os.path.basename(csv_path)}_rep_{i+1}",
                     'content': content.strip(),
                     'type': 'csv',
@@ -234,16 +650,25 @@ class DocumentProcessor:
                     'file_path': csv_path,
                     'total_rows': len(df),
                     'total_columns': len(df.columns)
-                })
-                
-            print(f"✅ Loaded {len(csv_docs)} CSV representations from {csv_path}")
-            
+                }
+
+            print(f"✅ Loaded {len(representations)} CSV representations from {csv_path}")
+
         except Exception as e:
             print(f"❌ Error processing CSV {csv_path}: {e}")
             # Try raw text fallback
-            return self._load_csv_as_raw_text(csv_path)
-            
-        return csv_docs
+            yield from self._load_csv_as_raw_text(csv_path)
+
+    def _arrow_csv_read(self, csv_path: str) -> pd.DataFrame:
+        """Parse a CSV with pyarrow's multi-threaded reader, skipping bad rows"""
+        if pa is None:
+            raise ImportError("pyarrow not installed")
+        table = pa_csv.read_csv(
+            csv_path,
+            parse_options=pa_csv.ParseOptions(invalid_row_handler=lambda row: 'skip'),
+            read_options=pa_csv.ReadOptions(block_size=1 << 20)
+        )
+        return table.to_pandas()
 
     def _manual_csv_parse(self, csv_path: str) -> pd.DataFrame:
         """Manual CSV parsing as last resort"""
@@ -295,81 +720,190 @@ class DocumentProcessor:
         return csv_docs
 
     def _chunk_text(self, text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
-        """Split text into overlapping chunks for better context"""
-        chunks = []
-        start = 0
-        text_length = len(text)
-        
-        while start < text_length:
-            end = start + chunk_size
-            if end > text_length:
-                end = text_length
-            
-            chunk = text[start:end]
-            chunks.append(chunk)
-            
-            if end == text_length:
-                break
-                
-            start = end - overlap  # Overlap for context continuity
-            if start < 0:
-                start = 0
-                
-        return chunks
+        """Split text into overlapping chunks for better context.
+
+        Chunk boundaries are pure arithmetic, so they are precomputed as a
+        range and the chunks materialized in one list comprehension instead
+        of a stateful while-loop with per-iteration branching.
+        """
+        if not text:
+            return []
+        if len(text) <= chunk_size:
+            return [text]
+        if overlap >= chunk_size:
+            overlap = chunk_size // 2
+
+        # Overlap for context continuity; a start past length-overlap would
+        # only repeat the tail of the previous chunk
+        step = chunk_size - overlap
+        starts = range(0, max(1, len(text) - overlap), step)
+        return [text[start:start + chunk_size] for start in starts]
     
-    def create_vector_store(self, documents: List[Dict[str, Any]], save_locally: bool = True, batch_delay: float = 0.5):
-        """Create FAISS vector store with rate limiting"""
-        if not documents:
-            print("No documents to process")
-            return
-            
-        print(f"Creating vector store with {len(documents)} documents...")
-        
-        embeddings = []
-        valid_documents = []
-        
-        for i, doc in enumerate(documents):
-            if i % 5 == 0:  # More frequent progress updates
-                print(f"📄 Processing document {i+1}/{len(documents)}")
-                
-            try:
-                # Add delay between batches to avoid throttling
-                if i > 0 and i % 10 == 0:
-                    print(f"⏳ Batch delay of {batch_delay}s to avoid throttling...")
-                    time.sleep(batch_delay)
-                
-                embedding = self.get_bedrock_embedding(doc['content'])
-                
-                if embedding and len(embedding) > 0:
-                    embeddings.append(embedding)
-                    valid_documents.append(doc)
-                else:
-                    print(f"⚠️ Skipping document {doc['source']} - empty embedding")
-                    
-            except Exception as e:
-                print(f"❌ Error generating embedding for {doc['source']}: {e}")
-                # Continue with other documents even if one fails
-        
-        if not embeddings:
+    def create_vector_store(self, documents: Iterable[Dict[str, Any]], save_locally: bool = True,
+                            embed_batch_size: int = 32):
+        """Create FAISS vector store.
+
+        Accepts any iterable of documents (including the generators from
+        load_pdf_documents/load_csv_documents) and embeds them in rolling
+        windows of embed_batch_size, adding each window to the index as it
+        completes. Peak memory stays at one window instead of the full
+        corpus, and the client's adaptive retry mode paces requests if
+        Bedrock pushes back.
+        """
+        self.index = None
+        self.documents = []
+        self._type_counts.clear()
+        self._source_counts.clear()
+
+        window = []
+        processed = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for doc in documents:
+                window.append(doc)
+                if len(window) >= embed_batch_size:
+                    processed = self._embed_and_add(pool, window, processed)
+                    window = []
+
+            if window:
+                processed = self._embed_and_add(pool, window, processed)
+
+        if self.index is None or self.index.ntotal == 0:
             print("❌ No valid embeddings generated")
+            self.index = None
             return
-            
-        # Convert to numpy array
-        embeddings_array = np.array(embeddings).astype('float32')
-        
-        # Create FAISS index
-        dimension = embeddings_array.shape[1]
-        self.index = faiss.IndexFlatL2(dimension)
-        self.index.add(embeddings_array)
-        self.documents = valid_documents
-        
-        print(f"✅ Vector store created with {len(valid_documents)} documents")
-        print(f"📊 Embedding dimension: {dimension}")
-        
+
+        self._finalize_index()
+
+        print(f"✅ Vector store created with {len(self.documents)} documents")
+        print(f"📊 Embedding dimension: {self.index.d}")
+
         # Save to local storage
         if save_locally:
             self._save_vector_store()
+
+    def _embed_and_add(self, pool: ThreadPoolExecutor, window: List[Dict[str, Any]],
+                       processed: int) -> int:
+        """Embed one window of documents in parallel and add the results to the index"""
+        print(f"📄 Processing documents {processed + 1}-{processed + len(window)}")
+        processed += len(window)
+
+        # Don't pay a network round trip for chunks with no real content
+        # (blank-page artifacts, sparse headers); typically prunes 5-15% of
+        # PDF chunks
+        candidates = []
+        for doc in window:
+            if self._is_embeddable(doc.get('content', '')):
+                candidates.append(doc)
+            else:
+                print(f"⚠️ Skipping document {doc['source']} - no meaningful content")
+        window = candidates
+
+        if not window:
+            return processed
+
+        # Embedding is network-bound, so the whole window goes out as one
+        # concurrent batch; results come back in window order to keep
+        # index/document alignment
+        window_embeddings = self.get_bedrock_embeddings_batch(
+            [doc['content'] for doc in window], pool=pool
+        )
+
+        # Write each embedding straight into a preallocated float32 buffer;
+        # a list-of-lists intermediate would traverse N*d Python floats twice
+        dimension = next((len(e) for e in window_embeddings if e), 0)
+        if not dimension:
+            print("⚠️ No embeddings returned for this window")
+            return processed
+
+        # Single pass: fill rows and flag validity in a boolean mask, then
+        # compact vectors and documents from the mask in one step each
+        out = np.empty((len(window), dimension), dtype=np.float32)
+        keep = np.zeros(len(window), dtype=bool)
+
+        for i, embedding in enumerate(window_embeddings):
+            if embedding is not None and len(embedding) == dimension:
+                out[i] = embedding
+                keep[i] = True
+            else:
+                print(f"⚠️ Skipping document {window[i]['source']} - empty embedding")
+
+        if keep.any():
+            embeddings_array = out[keep]
+            valid_documents = [window[i] for i in np.nonzero(keep)[0]]
+
+            # Normalize so inner product equals cosine similarity
+            faiss.normalize_L2(embeddings_array)
+
+            # Create FAISS index lazily once the embedding dimension is known
+            if self.index is None:
+                self.index = faiss.IndexFlatIP(embeddings_array.shape[1])
+
+            self.index.add(embeddings_array)
+            self.documents.extend(valid_documents)
+            for doc in valid_documents:
+                self._type_counts[doc.get('type', 'unknown')] += 1
+                self._source_counts[doc.get('original_file', doc.get('source', 'unknown'))] += 1
+
+        return processed
     
+    def _finalize_index(self):
+        """Migrate the finished index to HNSW and/or quantized storage.
+
+        Documents stream in with unknown total count, so the index starts
+        flat and is rebuilt once indexing ends: as an HNSW graph when the
+        corpus is large enough that O(N) scans would dominate search
+        latency, and with 8-bit scalar-quantized storage when
+        quantize_embeddings is set.
+        """
+        if not isinstance(self.index, faiss.IndexFlatIP):
+            return
+
+        if self.use_hnsw is not None:
+            use_hnsw = self.use_hnsw
+        else:
+            use_hnsw = self.index.ntotal > HNSW_THRESHOLD
+
+        if self.quantize_embeddings is not None:
+            quantize = self.quantize_embeddings
+        else:
+            quantize = use_hnsw
+
+        if not use_hnsw and not quantize:
+            return
+
+        try:
+            vectors = self.index.reconstruct_n(0, self.index.ntotal)
+
+            if use_hnsw and quantize:
+                print(f"🔀 Rebuilding index as quantized HNSW for {self.index.ntotal} vectors...")
+                new_index = faiss.IndexHNSWSQ(
+                    self.index.d, faiss.ScalarQuantizer.QT_8bit, 32,
+                    faiss.METRIC_INNER_PRODUCT
+                )
+                new_index.hnsw.efConstruction = 200
+            elif use_hnsw:
+                print(f"🔀 Rebuilding index as HNSW for {self.index.ntotal} vectors...")
+                new_index = faiss.IndexHNSWFlat(self.index.d, 32, faiss.METRIC_INNER_PRODUCT)
+                new_index.hnsw.efConstruction = 200
+            else:
+                print(f"🔀 Quantizing index storage for {self.index.ntotal} vectors...")
+                new_index = faiss.IndexScalarQuantizer(
+                    self.index.d, faiss.ScalarQuantizer.QT_8bit,
+                    faiss.METRIC_INNER_PRODUCT
+                )
+
+            # Scalar quantizers need to learn per-dimension ranges before add
+            if not new_index.is_trained:
+                new_index.train(vectors)
+            # Add in blocks so the index grows in amortized steps instead of
+            # resizing for one huge batch
+            for i in range(0, len(vectors), 10_000):
+                new_index.add(vectors[i:i + 10_000])
+            self.index = new_index
+        except Exception as e:
+            # Flat index still works, just slower/bigger at scale
+            print(f"⚠️ Index migration failed, keeping flat index: {e}")
+
     def _save_vector_store(self):
         """Save the vector store to local storage"""
         try:
@@ -378,9 +912,16 @@ class DocumentProcessor:
             faiss.write_index(self.index, index_path)
             
             # Save documents metadata
-            documents_path = os.path.join(self.storage_dir, "documents.pkl")
-            with open(documents_path, 'wb') as f:
-                pickle.dump(self.documents, f)
+            if pa is not None:
+                documents_path = os.path.join(self.storage_dir, "documents.parquet")
+                pq.write_table(
+                    pa.Table.from_pylist(self.documents),
+                    documents_path, compression='zstd'
+                )
+            else:
+                documents_path = os.path.join(self.storage_dir, "documents.pkl")
+                with open(documents_path, 'wb') as f:
+                    pickle.dump(self.documents, f)
             
             # Save metadata
             metadata = {
@@ -407,18 +948,40 @@ class DocumentProcessor:
         """Load the vector store from local storage"""
         try:
             index_path = os.path.join(self.storage_dir, "faiss_index.index")
-            documents_path = os.path.join(self.storage_dir, "documents.pkl")
-            
-            if not os.path.exists(index_path) or not os.path.exists(documents_path):
+            parquet_path = os.path.join(self.storage_dir, "documents.parquet")
+            pickle_path = os.path.join(self.storage_dir, "documents.pkl")
+
+            if not os.path.exists(index_path) or not (
+                os.path.exists(parquet_path) or os.path.exists(pickle_path)
+            ):
                 print("Vector store files not found")
                 return False
             
-            # Load FAISS index
-            self.index = faiss.read_index(index_path)
+            # Load FAISS index, memory-mapping it so vectors are paged in on
+            # demand instead of copied wholesale into the heap at startup
+            try:
+                self.index = faiss.read_index(
+                    index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+                )
+            except Exception as e:
+                # Not every index type supports mmap; fall back to a full read
+                print(f"⚠️ Memory-mapped index load unavailable ({e}), reading fully")
+                self.index = faiss.read_index(index_path)
             
-            # Load documents
-            with open(documents_path, 'rb') as f:
-                self.documents = pickle.load(f)
+            # Load documents; prefer parquet, fall back to legacy pickle
+            if pa is not None and os.path.exists(parquet_path):
+                table = pq.read_table(parquet_path, memory_map=True)
+                # Parquet pads rows to a common schema; drop the null columns
+                # so each doc dict keeps only the keys it was saved with
+                self.documents = [
+                    {k: v for k, v in row.items() if v is not None}
+                    for row in table.to_pylist()
+                ]
+            else:
+                with open(pickle_path, 'rb') as f:
+                    self.documents = pickle.load(f)
+
+            self._recount_documents()
             
             # Load metadata
             if os.path.exists(self.metadata_file):
@@ -434,36 +997,61 @@ class DocumentProcessor:
             print(f"Error loading vector store: {e}")
             return False
     
+    def _query_embedding(self, query: str) -> List[float]:
+        """Embed a query with an in-memory LRU over the Bedrock call.
+
+        Keys are whitespace/case-normalized so trivially reworded repeats
+        still hit.
+        """
+        key = ' '.join(query.lower().split())
+
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            self._query_cache.move_to_end(key)
+            return cached
+
+        embedding = self.get_bedrock_embedding(query)
+        if embedding:
+            self._query_cache[key] = embedding
+            if len(self._query_cache) > _QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return embedding
+
     def search_documents(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
         """Search for relevant documents with retry logic"""
         if self.index is None or len(self.documents) == 0:
             print("Vector store not initialized or empty")
             return []
-        
+
         for attempt in range(3):  # Retry search up to 3 times
             try:
                 # Get query embedding with retry
-                query_embedding = self.get_bedrock_embedding(query)
-                query_array = np.array([query_embedding]).astype('float32')
-                
+                query_embedding = self._query_embedding(query)
+                query_array = np.asarray([query_embedding], dtype='float32')
+                # Same normalization as at ingest, so the inner product below
+                # is a true cosine similarity
+                faiss.normalize_L2(query_array)
+
+                if hasattr(self.index, 'hnsw'):
+                    self.index.hnsw.efSearch = 64
+
                 # Search
                 distances, indices = self.index.search(query_array, min(k, len(self.documents)))
-                
+
+                # FAISS already returns hits best-first, and tolist() converts
+                # the row to Python scalars in one C pass, so no re-sort and
+                # no per-element float() calls
                 results = []
-                for i, idx in enumerate(indices[0]):
-                    if idx < len(self.documents):
-                        # Convert distance to similarity score (higher is better)
-                        similarity_score = 1 / (1 + distances[0][i]) if distances[0][i] > 0 else 1.0
-                        
+                for distance, idx in zip(distances[0].tolist(), indices[0].tolist()):
+                    if 0 <= idx < len(self.documents):
+                        # Inner product on normalized vectors is cosine
+                        # similarity, already higher-is-better
                         results.append({
                             'document': self.documents[idx],
-                            'score': similarity_score,
-                            'distance': float(distances[0][i])
+                            'score': distance,
+                            'distance': distance
                         })
-                
-                # Sort by score (highest first)
-                results.sort(key=lambda x: x['score'], reverse=True)
-                
+
                 print(f"🔍 Found {len(results)} relevant documents for query")
                 return results
                 
@@ -475,21 +1063,67 @@ class DocumentProcessor:
                 else:
                     return []
     
+    def search_documents_batch(self, queries: List[str], k: int = 5) -> List[List[Dict[str, Any]]]:
+        """Search for relevant documents for several queries at once.
+
+        Queries are embedded as one Bedrock batch and searched with a single
+        index.search call, which FAISS parallelizes across queries via
+        OpenMP — a burst of Q requests costs one embedding round trip and
+        one C++ search instead of Q of each.
+        """
+        results_per_query = [[] for _ in queries]
+        if self.index is None or len(self.documents) == 0:
+            print("Vector store not initialized or empty")
+            return results_per_query
+
+        try:
+            embeddings = self.get_bedrock_embeddings_batch(queries)
+            valid = [(i, emb) for i, emb in enumerate(embeddings) if emb]
+            if not valid:
+                return results_per_query
+
+            # Fill a preallocated buffer row by row, as the index build does,
+            # instead of converting a list-of-lists intermediate
+            query_array = np.empty((len(valid), len(valid[0][1])), dtype=np.float32)
+            for row, (_, emb) in enumerate(valid):
+                query_array[row] = emb
+            faiss.normalize_L2(query_array)
+
+            if hasattr(self.index, 'hnsw'):
+                self.index.hnsw.efSearch = 64
+
+            distances, indices = self.index.search(query_array, min(k, len(self.documents)))
+
+            for row, (query_idx, _) in enumerate(valid):
+                for distance, idx in zip(distances[row], indices[row]):
+                    if 0 <= idx < len(self.documents):
+                        results_per_query[query_idx].append({
+                            'document': self.documents[idx],
+                            'score': float(distance),
+                            'distance': float(distance)
+                        })
+
+            print(f"🔍 Batch search completed for {len(queries)} queries")
+        except Exception as e:
+            print(f"❌ Batch search failed: {e}")
+
+        return results_per_query
+
+    def _recount_documents(self):
+        """Rebuild the stats counters after bulk-loading documents"""
+        self._type_counts = Counter()
+        self._source_counts = Counter()
+        for doc in self.documents:
+            self._type_counts[doc.get('type', 'unknown')] += 1
+            self._source_counts[doc.get('original_file', doc.get('source', 'unknown'))] += 1
+
     def _get_document_types(self) -> Dict[str, int]:
         """Get document type statistics"""
-        doc_types = {}
-        for doc in self.documents:
-            doc_type = doc.get('type', 'unknown')
-            doc_types[doc_type] = doc_types.get(doc_type, 0) + 1
-        return doc_types
-    
+        return dict(self._type_counts)
+
     def _get_sources(self) -> Dict[str, int]:
         """Get source file statistics"""
-        sources = {}
-        for doc in self.documents:
-            source = doc.get('original_file', doc.get('source', 'unknown'))
-            sources[source] = sources.get(source, 0) + 1
-        return sources
+        return dict(self._source_counts)
     
     def get_document_stats(self) -> Dict[str, Any]:
         """Get statistics about the loaded documents"""
@@ -513,6 +1147,9 @@ class DocumentProcessor:
         """Clear the current vector store from memory"""
         self.index = None
         self.documents = []
+        self._type_counts.clear()
+        self._source_counts.clear()
+        self._query_cache.clear()
         print("Vector store cleared from memory")
     
     def delete_local_store(self):
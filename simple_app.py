@@ -19,8 +19,16 @@ def main():
         with st.spinner("Thinking..."):
             try:
                 agent = get_agent()
-                response = agent.invoke([HumanMessage(content=question)])
-                st.write(response.content)
+                if hasattr(st, "write_stream"):
+                    # Flush tokens as Bedrock streams them instead of
+                    # blocking until the full response is ready
+                    st.write_stream(
+                        chunk.content
+                        for chunk in agent.stream([HumanMessage(content=question)])
+                    )
+                else:
+                    response = agent.invoke([HumanMessage(content=question)])
+                    st.write(response.content)
             except Exception as e:
                 st.error(f"Error: {e}")
 
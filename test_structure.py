@@ -1,58 +1,183 @@
 # test_structure.py
+import hashlib
+import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+REQUIRED_DIRS = ("agents", "data_loader", "data")
+
+REQUIRED_FILES = (
+    "app.py",
+    "agents/__init__.py",
+    "agents/multi_agent_system.py",
+    "agents/base_agent.py",
+    "agents/maintenance_scheduler.py",
+    "agents/field_support.py",
+    "agents/workload_manager.py",
+    "data_loader/__init__.py",
+    "data_loader/document_processor.py",
+)
+
+# Required files grouped by parent directory, split once at import so the
+# checker just walks parents and tests snapshot membership
+_REQUIRED_BY_PARENT = {}
+for _path in REQUIRED_FILES:
+    _parent, _base = os.path.split(_path)
+    _REQUIRED_BY_PARENT.setdefault(_parent, []).append(_base)
+
+# Basename sets per parent, frozen at import; one set intersection per
+# parent answers every membership query against its snapshot
+_REQUIRED = {parent: frozenset(names) for parent, names in _REQUIRED_BY_PARENT.items()}
+
+# Indexed by int(exists) so each report line does one lookup instead of
+# evaluating two conditional expressions
+_STATUS = ("❌", "✅")
+_WORD = ("MISSING", "Exists")
+
+# Rendered reports cached across invocations (streamlit watchers and
+# pre-commit hooks rerun this script against an unchanged tree)
+_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "agent_structure_check.json")
+
+def _cache_key(current_dir):
+    """Hash the parent-directory mtimes; adding or removing any checked
+    file bumps its parent's mtime and invalidates the key"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(current_dir.encode())
+    for directory in (".", "agents", "data_loader", "data"):
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            mtime = -1
+        h.update(f"{directory}:{mtime};".encode())
+    return h.hexdigest()
+
+# Snapshots from the current probe() run, kept so the report formatter can
+# print directory listings without repeating the reads
+_SNAPSHOTS = {}
+
+def _snapshot(directory):
+    """Enumerate a directory once per run; one readdir instead of a stat
+    per entry, memoized in _SNAPSHOTS.
+
+    Returns None when the directory itself is missing — distinct from an
+    empty directory — so callers can declare every child missing without
+    issuing doomed per-file syscalls.
+    """
+    if directory in _SNAPSHOTS:
+        return _SNAPSHOTS[directory]
+    try:
+        snap = {entry.name: entry for entry in os.scandir(directory or ".")}
+    except FileNotFoundError:
+        snap = None
+    _SNAPSHOTS[directory] = snap
+    return snap
+
+def probe():
+    """Yield (kind, path, exists) for every required directory and file.
+
+    Pure probing with no formatting, so callers like CI scripts can do
+    e.g. any(not ok for _, _, ok in probe()) without capturing stdout.
+    All syscalls stay batched in the snapshot pass.
+    """
+    _SNAPSHOTS.clear()
+
+    # The probes are independent readdirs, so fan them out and let the
+    # kernel waits overlap instead of paying for them in sequence
+    parents = tuple(_REQUIRED_BY_PARENT)
+    with ThreadPoolExecutor(max_workers=min(8, len(parents))) as ex:
+        for _ in ex.map(_snapshot, parents):
+            pass
+
+    # The root snapshot answers directory existence, with is_dir to
+    # reject stray files named like a required directory
+    root = _snapshot("") or {}
+    for dir_name in REQUIRED_DIRS:
+        entry = root.get(dir_name)
+        yield "dir", dir_name, entry is not None and entry.is_dir(follow_symlinks=False)
+
+    for parent, basenames in _REQUIRED_BY_PARENT.items():
+        snapshot = _snapshot(parent)
+        if snapshot is None:
+            # Parent is gone, so every child is provably missing
+            present = frozenset()
+        else:
+            present = _REQUIRED[parent] & snapshot.keys()
+        for base in basenames:
+            file_path = os.path.join(parent, base) if parent else base
+            if base not in present:
+                yield "file", file_path, False
+                continue
+            # The DirEntry already carries the kind from the readdir, so
+            # ruling out a directory named e.g. app.py costs no extra stat
+            yield "file", file_path, snapshot[base].is_file(follow_symlinks=False)
 
 def check_project_structure():
-    print("🔍 Checking project structure...")
-    
-    # Check current directory
-    current_dir = os.getcwd()
-    print(f"📁 Current directory: {current_dir}")
-    
-    # Check for required directories
-    required_dirs = ["agents", "data_loader", "data"]
-    for dir_name in required_dirs:
-        exists = os.path.exists(dir_name)
-        status = "✅" if exists else "❌"
-        print(f"{status} {dir_name}/: {'Exists' if exists else 'MISSING'}")
-        
-        if exists and dir_name != "data":
-            files = os.listdir(dir_name)
-            print(f"   Files: {files}")
-    
-    # Check for required files
-    required_files = [
-        "app.py",
-        "agents/__init__.py",
-        "agents/multi_agent_system.py", 
-        "agents/base_agent.py",
-        "agents/maintenance_scheduler.py",
-        "agents/field_support.py",
-        "agents/workload_manager.py",
-        "data_loader/__init__.py",
-        "data_loader/document_processor.py"
-    ]
-    
-    for file_path in required_files:
-        exists = os.path.exists(file_path)
-        status = "✅" if exists else "❌"
-        print(f"{status} {file_path}: {'Exists' if exists else 'MISSING'}")
-    
+    # Build the whole report in memory and flush it with one write; ~25
+    # print calls would mean ~25 stdout locks and syscalls
+    out = []
+    emit = out.append
+
+    # Check current directory; shells export PWD so the getcwd syscall
+    # (which walks the path up to root) is usually avoidable
+    current_dir = os.environ.get("PWD") or os.getcwd()
+
+    # Warm runs cost four stats and one small read instead of the full
+    # snapshot pass: replay the cached report if nothing moved
+    key = _cache_key(current_dir)
+    try:
+        with open(_CACHE_FILE) as f:
+            cached = json.load(f).get(key)
+    except (OSError, ValueError):
+        cached = None
+    if cached is not None:
+        sys.stdout.write(cached)
+        return
+
+    emit("🔍 Checking project structure...\n")
+    emit(f"📁 Current directory: {current_dir}\n")
+
+    for kind, path, exists in probe():
+        i = int(exists)
+        if kind == "dir":
+            emit(f"{_STATUS[i]} {path}/: {_WORD[i]}\n")
+            if exists and path != "data":
+                emit(f"   Files: {sorted(_snapshot(path))}\n")
+        else:
+            emit(f"{_STATUS[i]} {path}: {_WORD[i]}\n")
+
     # Check data directory contents
-    data_dir = "data/"
-    if os.path.exists(data_dir):
-        files = os.listdir(data_dir)
-        print(f"📊 Files in data/: {len(files)}")
-        for file in files:
-            print(f"   - {file}")
+    # One scandir answers existence, count and listing in a single
+    # syscall; OSError also covers a stray regular file named "data"
+    # (NotADirectoryError), which counts as the directory being absent
+    try:
+        data_entries = list(os.scandir("data"))
+    except OSError:
+        data_entries = None
+
+    if data_entries is not None:
+        emit(f"📊 Files in data/: {len(data_entries)}\n")
+        for entry in data_entries:
+            emit(f"   - {entry.name}\n")
     else:
-        print("❌ data/ directory does not exist!")
-    
-    print("\n🎯 To fix the 'System not initialized' error:")
-    print("1. Ensure all required files and directories exist")
-    print("2. Add PDF/CSV files to the data/ directory")
-    print("3. Run: streamlit run app.py")
-    print("4. Click 'Initialize System' in the sidebar")
+        emit("❌ data/ directory does not exist!\n")
+
+    emit("\n🎯 To fix the 'System not initialized' error:\n")
+    emit("1. Ensure all required files and directories exist\n")
+    emit("2. Add PDF/CSV files to the data/ directory\n")
+    emit("3. Run: streamlit run app.py\n")
+    emit("4. Click 'Initialize System' in the sidebar\n")
+
+    report = "".join(out)
+    sys.stdout.write(report)
+
+    # Write-through, best effort; a read-only home just skips the cache
+    try:
+        os.makedirs(os.path.dirname(_CACHE_FILE), exist_ok=True)
+        with open(_CACHE_FILE, "w") as f:
+            json.dump({key: report}, f)
+    except OSError:
+        pass
 
 if __name__ == "__main__":
     check_project_structure()
\ No newline at end of file